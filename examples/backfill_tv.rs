@@ -44,7 +44,8 @@ async fn main() -> Result<()> {
     let concurrency = parse_concurrency();
     info!("Starting TV backfill (concurrency={})", concurrency);
 
-    let notion_client = NotionClient::from_env()?;
+    let http_client = cinelink::http::build_client()?;
+    let notion_client = NotionClient::from_env_with_client(http_client.clone())?;
     let notion: Arc<dyn NotionApi> = Arc::new(notion_client.clone());
     let schema = match notion.fetch_property_schema().await {
         Ok(s) => Arc::new(s),
@@ -57,8 +58,8 @@ async fn main() -> Result<()> {
         .title_property
         .clone()
         .unwrap_or_else(|| "Name".to_string());
-    let tmdb: Arc<dyn TmdbApi> = Arc::new(TmdbClient::from_env()?);
-    let anilist: Arc<dyn AniListApi> = Arc::new(AniListClient::new()?);
+    let tmdb: Arc<dyn TmdbApi> = Arc::new(TmdbClient::from_env_with_client(http_client.clone())?);
+    let anilist: Arc<dyn AniListApi> = Arc::new(AniListClient::with_client(http_client));
 
     let state = AppState {
         notion,
@@ -73,25 +74,55 @@ async fn main() -> Result<()> {
             count: 0,
         })),
         recent_events: Arc::new(Mutex::new(HashMap::new())),
+        dedupe_store: None,
         processing_sem: Arc::new(Semaphore::new(concurrency)),
     };
 
     let sem = Arc::new(Semaphore::new(concurrency));
     let mut joinset = JoinSet::new();
-    let mut cursor: Option<String> = None;
 
     let mut scanned = 0usize;
     let mut candidates = 0usize;
     let mut updated = 0usize;
 
-    loop {
+    // Ask Notion for pages with a Season value instead of scanning the whole
+    // database; the finer checks (title marker, Type, parseable season) still
+    // run client-side below.
+    let filter = serde_json::json!({
+        "property": "Season",
+        "select": { "is_not_empty": true }
+    });
+
+    // Pipeline the scan: fetch the next page while the current page's tasks
+    // are dispatched, so the query round-trip overlaps with processing.
+    let mut pending_fetch = Some({
+        let client = notion_client.clone();
+        let filter = filter.clone();
+        tokio::spawn(async move {
+            client
+                .query_database_page_filtered(None, 100, Some(&filter))
+                .await
+        })
+    });
+
+    while let Some(fetch) = pending_fetch.take() {
         let DatabaseQueryResponse {
             results,
             has_more,
             next_cursor,
-        } = notion_client
-            .query_database_page(cursor.as_deref(), 100)
-            .await?;
+        } = fetch.await??;
+
+        if has_more {
+            if let Some(cursor) = next_cursor {
+                let client = notion_client.clone();
+                let filter = filter.clone();
+                pending_fetch = Some(tokio::spawn(async move {
+                    client
+                        .query_database_page_filtered(Some(&cursor), 100, Some(&filter))
+                        .await
+                }));
+            }
+        }
 
         for page in results {
             scanned += 1;
@@ -126,7 +157,7 @@ async fn main() -> Result<()> {
             let sem_for_task = sem.clone();
             joinset.spawn(async move {
                 let _permit = sem_for_task.acquire_owned().await?;
-                process_page_backfill_tv(&state_for_task, &page_id).await
+                process_page_backfill_tv(&state_for_task, &page_id, page).await
             });
 
             while joinset.len() >= concurrency * 4 {
@@ -140,14 +171,6 @@ async fn main() -> Result<()> {
                 }
             }
         }
-
-        if !has_more {
-            break;
-        }
-        cursor = next_cursor;
-        if cursor.is_none() {
-            break;
-        }
     }
 
     while let Some(res) = joinset.join_next().await {
@@ -4,11 +4,11 @@ use serde::Deserialize;
 use serde_json::json;
 use std::collections::HashMap;
 use std::sync::Arc;
-use std::time::Duration;
 use std::time::Instant;
 use tokio::sync::Mutex;
 
 use super::AniListMapped;
+use crate::http::retry_delay;
 
 const ANILIST_ENDPOINT: &str = "https://graphql.anilist.co";
 const RELATIONS_CACHE_TTL_SECS: u64 = 60 * 60 * 24; // 24 hours
@@ -46,18 +46,19 @@ impl AniListMediaType {
 
 impl AniListClient {
     pub fn new() -> Result<Self> {
-        let user_agent = format!("cinelink/{}", env!("CARGO_PKG_VERSION"));
-        let client = Client::builder()
-            .connect_timeout(Duration::from_secs(5))
-            .timeout(Duration::from_secs(30))
-            .user_agent(user_agent)
-            .build()
-            .context("Failed to build AniList HTTP client")?;
-        Ok(Self {
+        let client =
+            crate::http::build_client().context("Failed to build AniList HTTP client")?;
+        Ok(Self::with_client(client))
+    }
+
+    /// Like [`new`](Self::new) but reusing an already-built client, so
+    /// multiple API clients can share one connection pool.
+    pub fn with_client(client: reqwest::Client) -> Self {
+        Self {
             client,
             relations_cache: Arc::new(Mutex::new(HashMap::new())),
             title_cache: Arc::new(Mutex::new(HashMap::new())),
-        })
+        }
     }
 
     pub async fn fetch_mapped(
@@ -138,7 +139,7 @@ query ($search: String!, $type: MediaType!) {
         });
 
         let res = self
-            .post_with_retry(|| self.client.post(ANILIST_ENDPOINT).json(&body))
+            .post_with_retry(&body)
             .await
             .context("AniList search request failed")?;
 
@@ -238,7 +239,7 @@ query ($id: Int!, $type: MediaType!) {
         });
 
         let res = self
-            .post_with_retry(|| self.client.post(ANILIST_ENDPOINT).json(&body))
+            .post_with_retry(&body)
             .await
             .context("AniList relations request failed")?;
 
@@ -337,7 +338,7 @@ query ($id: Int!, $type: MediaType!) {
         });
 
         let res = self
-            .post_with_retry(|| self.client.post(ANILIST_ENDPOINT).json(&body))
+            .post_with_retry(&body)
             .await
             .context("AniList request failed")?;
 
@@ -415,7 +416,7 @@ query ($id: Int!, $type: MediaType!) {
         });
 
         let res = self
-            .post_with_retry(|| self.client.post(ANILIST_ENDPOINT).json(&body))
+            .post_with_retry(&body)
             .await
             .context("AniList titles request failed")?;
 
@@ -456,14 +457,20 @@ query ($id: Int!, $type: MediaType!) {
         Ok(title)
     }
 
-    async fn post_with_retry(
-        &self,
-        mut make_req: impl FnMut() -> reqwest::RequestBuilder,
-    ) -> Result<reqwest::Response> {
+    async fn post_with_retry(&self, body: &serde_json::Value) -> Result<reqwest::Response> {
+        // Serialize once up front; retries just re-send the same bytes.
+        let body_bytes =
+            serde_json::to_vec(body).context("Failed to serialize AniList request body")?;
         let mut attempt = 0usize;
         loop {
             attempt += 1;
-            let res = make_req().send().await;
+            let res = self
+                .client
+                .post(ANILIST_ENDPOINT)
+                .header(reqwest::header::CONTENT_TYPE, "application/json")
+                .body(body_bytes.clone())
+                .send()
+                .await;
             match res {
                 Ok(resp) => {
                     if (resp.status().as_u16() == 429 || resp.status().is_server_error())
@@ -489,14 +496,25 @@ query ($id: Int!, $type: MediaType!) {
 
     async fn get_cached_relations(&self, id: i32) -> Option<RelationsPayload> {
         let mut guard = self.relations_cache.lock().await;
-        guard.retain(|_, v| v.inserted_at.elapsed().as_secs() < RELATIONS_CACHE_TTL_SECS);
-        guard.get(&id).map(|e| e.value.clone())
+        match guard.get(&id) {
+            Some(entry) if entry.inserted_at.elapsed().as_secs() < RELATIONS_CACHE_TTL_SECS => {
+                Some(entry.value.clone())
+            }
+            Some(_) => {
+                guard.remove(&id);
+                None
+            }
+            None => None,
+        }
     }
 
     async fn put_cached_relations(&self, id: i32, payload: RelationsPayload) {
         let mut guard = self.relations_cache.lock().await;
-        if guard.len() > MAX_CACHE_ENTRIES {
-            guard.clear();
+        if guard.len() >= MAX_CACHE_ENTRIES {
+            guard.retain(|_, v| v.inserted_at.elapsed().as_secs() < RELATIONS_CACHE_TTL_SECS);
+            if guard.len() >= MAX_CACHE_ENTRIES {
+                guard.clear();
+            }
         }
         guard.insert(
             id,
@@ -509,14 +527,25 @@ query ($id: Int!, $type: MediaType!) {
 
     async fn get_cached_title(&self, id: i32) -> Option<MediaTitle> {
         let mut guard = self.title_cache.lock().await;
-        guard.retain(|_, v| v.inserted_at.elapsed().as_secs() < TITLE_CACHE_TTL_SECS);
-        guard.get(&id).map(|e| e.value.clone())
+        match guard.get(&id) {
+            Some(entry) if entry.inserted_at.elapsed().as_secs() < TITLE_CACHE_TTL_SECS => {
+                Some(entry.value.clone())
+            }
+            Some(_) => {
+                guard.remove(&id);
+                None
+            }
+            None => None,
+        }
     }
 
     async fn put_cached_title(&self, id: i32, title: MediaTitle) {
         let mut guard = self.title_cache.lock().await;
-        if guard.len() > MAX_CACHE_ENTRIES {
-            guard.clear();
+        if guard.len() >= MAX_CACHE_ENTRIES {
+            guard.retain(|_, v| v.inserted_at.elapsed().as_secs() < TITLE_CACHE_TTL_SECS);
+            if guard.len() >= MAX_CACHE_ENTRIES {
+                guard.clear();
+            }
         }
         guard.insert(
             id,
@@ -656,24 +685,6 @@ pub(crate) struct RelationsPayload {
     pub(crate) edges: Vec<RelationEdge>,
 }
 
-fn retry_delay(attempt: usize, retry_after: Option<&reqwest::header::HeaderValue>) -> Duration {
-    if let Some(v) = retry_after.and_then(|h| h.to_str().ok()) {
-        if let Ok(secs) = v.parse::<u64>() {
-            return Duration::from_secs(secs.min(30));
-        }
-    }
-    let base_ms = 200u64.saturating_mul(2u64.saturating_pow((attempt - 1) as u32));
-    let jitter_ms = jitter_ms();
-    Duration::from_millis((base_ms + jitter_ms).min(5_000))
-}
-
-fn jitter_ms() -> u64 {
-    use std::time::{SystemTime, UNIX_EPOCH};
-    let now = SystemTime::now()
-        .duration_since(UNIX_EPOCH)
-        .unwrap_or_default();
-    (now.subsec_millis() as u64) % 100
-}
 
 fn normalize_title_key(input: &str) -> String {
     let mut out = String::with_capacity(input.len());
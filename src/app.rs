@@ -14,8 +14,9 @@ use axum::{
 use chrono::Utc;
 use constant_time_eq::constant_time_eq;
 use hmac::{Hmac, Mac};
-use serde_json::json;
+use serde_json::{json, Value};
 use sha2::Sha256;
+use std::path::{Path, PathBuf};
 use std::{collections::HashMap, env, net::SocketAddr, sync::Arc};
 use tokio::sync::Mutex;
 use tokio::sync::Semaphore;
@@ -30,6 +31,7 @@ const DEDUPE_TTL_SECS: i64 = 600; // 10 minutes
 const MAX_CONCURRENT_JOBS: usize = 8;
 const MAX_RATE_LIMIT_ENTRIES: usize = 10_000;
 const MAX_DEDUPE_ENTRIES: usize = 10_000;
+const DEDUPE_STORE_PATH: &str = "cache/recent_events.json";
 
 #[derive(Clone)]
 pub struct AppState {
@@ -42,6 +44,8 @@ pub struct AppState {
     pub rate_limits: Arc<Mutex<HashMap<String, WindowCounter>>>,
     pub global_limit: Arc<Mutex<WindowCounter>>,
     pub recent_events: Arc<Mutex<HashMap<String, i64>>>,
+    /// Where the dedupe map is persisted across restarts; None disables persistence.
+    pub dedupe_store: Option<PathBuf>,
     pub processing_sem: Arc<Semaphore>,
 }
 
@@ -52,7 +56,19 @@ pub struct WindowCounter {
 }
 
 pub async fn run_server() -> Result<()> {
-    let notion: Arc<dyn NotionApi> = Arc::new(NotionClient::from_env()?);
+    // One HTTP client (and thus one connection pool) shared by every API
+    // client; auth is attached per request, so sharing is safe.
+    let http_client = crate::http::build_client()?;
+    let notion: Arc<dyn NotionApi> = Arc::new(NotionClient::from_env_with_client(
+        http_client.clone(),
+    )?);
+
+    // Bind before the schema fetch: the fetch costs a Notion round-trip (plus
+    // retries when the API is slow), and binding early lets connections queue
+    // in the accept backlog during startup instead of being refused.
+    let addr = SocketAddr::from(([0, 0, 0, 0], 3146));
+    let listener = tokio::net::TcpListener::bind(addr).await?;
+
     let schema = match notion.fetch_property_schema().await {
         Ok(s) => Arc::new(s),
         Err(e) => {
@@ -66,8 +82,8 @@ pub async fn run_server() -> Result<()> {
         .unwrap_or_else(|| "Name".to_string());
     info!("Using title property: {}", title_property);
 
-    let tmdb: Arc<dyn TmdbApi> = Arc::new(TmdbClient::from_env()?);
-    let anilist: Arc<dyn AniListApi> = Arc::new(AniListClient::new()?);
+    let tmdb: Arc<dyn TmdbApi> = Arc::new(TmdbClient::from_env_with_client(http_client.clone())?);
+    let anilist: Arc<dyn AniListApi> = Arc::new(AniListClient::with_client(http_client));
     let signing_secret = env::var("NOTION_WEBHOOK_SECRET")
         .ok()
         .filter(|s| !s.is_empty())
@@ -79,7 +95,10 @@ pub async fn run_server() -> Result<()> {
         window: 0,
         count: 0,
     }));
-    let recent_events = Arc::new(Mutex::new(HashMap::new()));
+    // Reload the dedupe map so a restart inside the TTL window does not
+    // reprocess webhook deliveries Notion retries during the downtime.
+    let dedupe_store = PathBuf::from(DEDUPE_STORE_PATH);
+    let recent_events = Arc::new(Mutex::new(load_recent_events(&dedupe_store)));
     let processing_sem = Arc::new(Semaphore::new(MAX_CONCURRENT_JOBS));
 
     let state = AppState {
@@ -92,14 +111,13 @@ pub async fn run_server() -> Result<()> {
         rate_limits,
         global_limit,
         recent_events,
+        dedupe_store: Some(dedupe_store),
         processing_sem,
     };
 
     let app = build_router(state);
 
-    let addr = SocketAddr::from(([0, 0, 0, 0], 3146));
     info!("Listening on {}", addr);
-    let listener = tokio::net::TcpListener::bind(addr).await?;
     axum::serve(listener, app)
         .with_graceful_shutdown(shutdown_signal())
         .await?;
@@ -118,6 +136,28 @@ async fn health() -> &'static str {
     "OK"
 }
 
+/// The handful of webhook fields we act on; deserializing just these is
+/// cheaper than building a full JSON tree for every delivery.
+#[derive(serde::Deserialize)]
+struct WebhookPayload {
+    id: Option<String>,
+    #[serde(rename = "type")]
+    event_type: Option<String>,
+    entity: Option<WebhookEntity>,
+    data: Option<WebhookData>,
+}
+
+#[derive(serde::Deserialize)]
+struct WebhookEntity {
+    id: Option<String>,
+}
+
+#[derive(serde::Deserialize)]
+struct WebhookData {
+    #[serde(default)]
+    updated_properties: Vec<String>,
+}
+
 async fn handle_webhook(
     State(state): State<AppState>,
     headers: HeaderMap,
@@ -125,7 +165,8 @@ async fn handle_webhook(
 ) -> StatusCode {
     let ip = extract_ip(&headers);
     if !check_rate_limit(&state, &ip).await || !check_global_rate_limit(&state).await {
-        warn!("Rate limit exceeded for {}", ip);
+        // debug, not warn: during a flood this line would fire per request.
+        debug!("Rate limit exceeded for {}", ip);
         return StatusCode::TOO_MANY_REQUESTS;
     }
 
@@ -158,7 +199,7 @@ async fn handle_webhook(
         return StatusCode::OK;
     }
 
-    let payload: serde_json::Value = match serde_json::from_slice(&body) {
+    let payload: WebhookPayload = match serde_json::from_slice(&body) {
         Ok(v) => v,
         Err(e) => {
             warn!("Rejecting request: invalid JSON body: {}", e);
@@ -166,57 +207,36 @@ async fn handle_webhook(
         }
     };
 
-    if payload.get("type").and_then(|v| v.as_str()) != Some("page.properties_updated") {
-        warn!("Ignoring event with unsupported type");
+    // Non-actionable events are the common case (Notion fires one per edit),
+    // so keep their logging at debug to avoid per-event formatting cost.
+    if payload.event_type.as_deref() != Some("page.properties_updated") {
+        debug!("Ignoring event with unsupported type");
         return StatusCode::OK;
     }
 
-    if let Some(event_id) = payload.get("id").and_then(|v| v.as_str()) {
+    if let Some(event_id) = payload.id.as_deref() {
         if !dedupe_event(&state, event_id).await {
+            debug!("Ignoring duplicate event {}", event_id);
             return StatusCode::OK;
         }
     }
 
-    let updated_raw = payload
-        .get("data")
-        .and_then(|d| d.get("updated_properties"))
-        .and_then(|p| p.as_array())
-        .cloned()
-        .unwrap_or_default();
-
-    let updated_decoded: Vec<String> = updated_raw
-        .iter()
-        .filter_map(|v| v.as_str())
-        .map(|s| match urlencoding::decode(s) {
-            Ok(decoded) => decoded.into_owned(),
-            Err(_) => s.to_string(),
-        })
-        .collect();
-
-    let should_process = updated_raw.iter().any(|v| {
-        v.as_str() == Some("Siv%5D")
-            || updated_decoded.iter().any(|p| {
-                let lower = p.to_lowercase();
-                lower == "title" || lower == "season"
-            })
+    let should_process = payload.data.as_ref().is_some_and(|d| {
+        d.updated_properties
+            .iter()
+            .any(|p| is_trigger_property(p))
     });
     if !should_process {
+        debug!("Ignoring event with no trigger property change");
         return StatusCode::OK;
     }
 
-    let page_id = match payload
-        .get("entity")
-        .and_then(|e| e.get("id"))
-        .and_then(|v| v.as_str())
-    {
-        Some(id) => id.to_string(),
+    let page_id = match payload.entity.and_then(|e| e.id) {
+        Some(id) => id,
         None => return StatusCode::BAD_REQUEST,
     };
 
-    let event_id = payload
-        .get("id")
-        .and_then(|v| v.as_str())
-        .map(|s| s.to_string());
+    let event_id = payload.id;
 
     debug!(
         page_id = %page_id,
@@ -243,12 +263,15 @@ async fn handle_webhook(
     StatusCode::OK
 }
 
-pub async fn process_page_backfill_tv(state: &AppState, page_id: &str) -> Result<bool> {
-    process_page_inner(state, page_id, None, false).await
+/// Process a page the backfill scan already fetched; avoids a second
+/// per-page round-trip to the Notion API.
+pub async fn process_page_backfill_tv(state: &AppState, page_id: &str, page: Value) -> Result<bool> {
+    process_page_inner(state, page_id, None, false, page).await
 }
 
 async fn process_page(state: &AppState, page_id: &str, event_id: Option<&str>) -> Result<bool> {
-    process_page_inner(state, page_id, event_id, true).await
+    let page = state.notion.fetch_page(page_id).await?;
+    process_page_inner(state, page_id, event_id, true, page).await
 }
 
 async fn process_page_inner(
@@ -256,17 +279,13 @@ async fn process_page_inner(
     page_id: &str,
     event_id: Option<&str>,
     require_semicolon: bool,
+    page: Value,
 ) -> Result<bool> {
-    let page = state.notion.fetch_page(page_id).await?;
     let props = page
         .get("properties")
         .and_then(|p| p.as_object())
         .ok_or_else(|| anyhow::anyhow!("Page has no properties"))?;
 
-    // Enrich schema from live page properties (handles cases where DB schema is unavailable).
-    let mut schema = (*state.schema).clone();
-    notion::merge_schema_from_props(&mut schema, props);
-
     let raw_title = notion::extract_title(props, &state.title_property).unwrap_or_default();
 
     enum TriggerKind {
@@ -292,6 +311,19 @@ async fn process_page_inner(
         (TriggerKind::Tmdb, raw_title.trim().to_string())
     };
 
+    // Enrich schema from live page properties (handles cases where DB schema is
+    // unavailable). This runs only for armed pages — the unarmed steady state
+    // returns above without touching the schema — and only clones when the page
+    // has properties the shared schema doesn't know about.
+    let schema: std::borrow::Cow<'_, notion::PropertySchema> =
+        if props.keys().all(|k| state.schema.types.contains_key(k)) {
+            std::borrow::Cow::Borrowed(state.schema.as_ref())
+        } else {
+            let mut merged = (*state.schema).clone();
+            notion::merge_schema_from_props(&mut merged, props);
+            std::borrow::Cow::Owned(merged)
+        };
+
     let type_value = notion::extract_select(props, "Type");
     let is_tv = type_value
         .as_deref()
@@ -793,12 +825,13 @@ async fn process_anilist_page(
     Ok(true)
 }
 
+/// Tags prepended to every AniList-sourced genre list so those pages are
+/// easy to filter in Notion.
+const ANIME_TAGS: [&str; 2] = ["Anime", "Animation"];
+
 fn with_anime_tags(mut genres: Vec<String>) -> Vec<String> {
-    // Always tag AniList-sourced pages so they're easy to filter in Notion.
-    let tags = ["Anime", "Animation"];
-    let tag_lc: std::collections::HashSet<String> = tags.iter().map(|t| t.to_lowercase()).collect();
-    genres.retain(|g| !tag_lc.contains(&g.to_lowercase()));
-    for tag in tags.into_iter().rev() {
+    genres.retain(|g| !ANIME_TAGS.iter().any(|t| t.eq_ignore_ascii_case(g)));
+    for tag in ANIME_TAGS.into_iter().rev() {
         genres.insert(0, tag.to_string());
     }
     genres
@@ -821,6 +854,20 @@ async fn set_error_title(
         .map_err(|e| anyhow::anyhow!("Failed to set error title: {}", e))
 }
 
+/// True for property names that should trigger processing: the title, the
+/// Season property, or the raw Season update marker seen in production
+/// payloads. Decodes each entry at most once so the caller can short-circuit.
+fn is_trigger_property(raw: &str) -> bool {
+    if raw == "Siv%5D" {
+        return true;
+    }
+    let decoded = match urlencoding::decode(raw) {
+        Ok(decoded) => decoded,
+        Err(_) => std::borrow::Cow::Borrowed(raw),
+    };
+    decoded.eq_ignore_ascii_case("title") || decoded.eq_ignore_ascii_case("season")
+}
+
 fn verify_notion_signature(headers: &HeaderMap, body: &[u8], secret: &str) -> bool {
     let Some(sig_header) = headers
         .get("x-notion-signature")
@@ -916,13 +963,51 @@ async fn check_global_rate_limit(state: &AppState) -> bool {
 async fn dedupe_event(state: &AppState, event_id: &str) -> bool {
     let now = Utc::now().timestamp();
     let mut guard = state.recent_events.lock().await;
-    guard.retain(|_, ts| now - *ts <= DEDUPE_TTL_SECS);
-    if guard.len() > MAX_DEDUPE_ENTRIES {
-        guard.clear();
+    if let Some(ts) = guard.get(event_id) {
+        if now - *ts <= DEDUPE_TTL_SECS {
+            return false;
+        }
     }
-    if guard.contains_key(event_id) {
-        return false;
+    // Sweep expired entries only when the map is over capacity rather than on
+    // every event; a stale entry for this event is simply overwritten below.
+    if guard.len() >= MAX_DEDUPE_ENTRIES {
+        guard.retain(|_, ts| now - *ts <= DEDUPE_TTL_SECS);
+        if guard.len() >= MAX_DEDUPE_ENTRIES {
+            guard.clear();
+        }
     }
     guard.insert(event_id.to_string(), now);
+    if let Some(path) = &state.dedupe_store {
+        persist_recent_events(path, &guard);
+    }
     true
 }
+
+fn load_recent_events(path: &Path) -> HashMap<String, i64> {
+    let Ok(bytes) = std::fs::read(path) else {
+        return HashMap::new();
+    };
+    let mut events: HashMap<String, i64> = serde_json::from_slice(&bytes).unwrap_or_default();
+    let now = Utc::now().timestamp();
+    events.retain(|_, ts| now - *ts <= DEDUPE_TTL_SECS);
+    events
+}
+
+/// Best-effort persistence: a failed write only costs dedupe coverage after
+/// the next restart, so it is logged rather than propagated. Serialization is
+/// cheap and happens inline; the filesystem write runs on the blocking pool so
+/// it never stalls the webhook handler's runtime thread.
+fn persist_recent_events(path: &Path, events: &HashMap<String, i64>) {
+    let Ok(bytes) = serde_json::to_vec(events) else {
+        return;
+    };
+    let path = path.to_path_buf();
+    tokio::task::spawn_blocking(move || {
+        if let Some(parent) = path.parent() {
+            let _ = std::fs::create_dir_all(parent);
+        }
+        if let Err(e) = std::fs::write(&path, bytes) {
+            warn!("Failed to persist dedupe state to {}: {}", path.display(), e);
+        }
+    });
+}
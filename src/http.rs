@@ -0,0 +1,51 @@
+//! Shared HTTP client construction for the Notion, TMDB and AniList clients.
+use anyhow::{Context, Result};
+use reqwest::Client;
+use std::time::Duration;
+
+const CONNECT_TIMEOUT_SECS: u64 = 5;
+const REQUEST_TIMEOUT_SECS: u64 = 30;
+const POOL_MAX_IDLE_PER_HOST: usize = 10;
+const POOL_IDLE_TIMEOUT_SECS: u64 = 90;
+const TCP_KEEPALIVE_SECS: u64 = 60;
+
+/// Build a `reqwest::Client` with the pool and keep-alive settings shared by
+/// every outbound API client. Keeping idle connections warm means repeated
+/// Notion/TMDB/AniList calls skip the TCP + TLS handshake.
+pub fn build_client() -> Result<Client> {
+    let user_agent = format!("cinelink/{}", env!("CARGO_PKG_VERSION"));
+    Client::builder()
+        .connect_timeout(Duration::from_secs(CONNECT_TIMEOUT_SECS))
+        .timeout(Duration::from_secs(REQUEST_TIMEOUT_SECS))
+        .pool_max_idle_per_host(POOL_MAX_IDLE_PER_HOST)
+        .pool_idle_timeout(Duration::from_secs(POOL_IDLE_TIMEOUT_SECS))
+        .tcp_keepalive(Duration::from_secs(TCP_KEEPALIVE_SECS))
+        .user_agent(user_agent)
+        .build()
+        .context("Failed to build HTTP client")
+}
+
+/// Delay before retrying a 429/5xx or connection failure: honour a
+/// `Retry-After` header when present, otherwise exponential backoff with
+/// jitter, capped at 5 seconds.
+pub(crate) fn retry_delay(
+    attempt: usize,
+    retry_after: Option<&reqwest::header::HeaderValue>,
+) -> Duration {
+    if let Some(v) = retry_after.and_then(|h| h.to_str().ok()) {
+        if let Ok(secs) = v.parse::<u64>() {
+            return Duration::from_secs(secs.min(30));
+        }
+    }
+    let base_ms = 200u64.saturating_mul(2u64.saturating_pow((attempt - 1) as u32));
+    let jitter_ms = jitter_ms();
+    Duration::from_millis((base_ms + jitter_ms).min(5_000))
+}
+
+fn jitter_ms() -> u64 {
+    use std::time::{SystemTime, UNIX_EPOCH};
+    let now = SystemTime::now()
+        .duration_since(UNIX_EPOCH)
+        .unwrap_or_default();
+    (now.subsec_millis() as u64) % 100
+}
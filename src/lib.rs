@@ -1,5 +1,6 @@
 pub mod anilist;
 pub mod app;
+pub mod http;
 pub mod notion;
 pub mod notion_fallback;
 pub mod tmdb;
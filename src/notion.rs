@@ -5,10 +5,10 @@ use serde::Deserialize;
 use serde_json::{json, Map, Value};
 use std::collections::HashMap;
 use std::env;
-use std::time::Duration;
 use tokio::sync::OnceCell;
 use tracing::{info, warn};
 
+use crate::http::retry_delay;
 use crate::notion_fallback::fallback_schema;
 
 pub const NOTION_VERSION: &str = "2025-09-03";
@@ -17,7 +17,9 @@ const MAX_RETRIES: usize = 3;
 #[derive(Debug, Clone)]
 pub struct NotionClient {
     client: Client,
-    api_key: String,
+    /// `Authorization: Bearer <key>` prebuilt once; cloning a HeaderValue is a
+    /// cheap refcount bump, unlike formatting the bearer string per request.
+    auth_header: reqwest::header::HeaderValue,
     pub database_id: String,
     data_source_id: OnceCell<String>,
 }
@@ -103,25 +105,28 @@ pub enum ValueInput {
 
 impl NotionClient {
     pub fn from_env() -> Result<Self> {
+        let client = crate::http::build_client().context("Failed to build Notion HTTP client")?;
+        Self::from_env_with_client(client)
+    }
+
+    /// Like [`from_env`](Self::from_env) but reusing an already-built client,
+    /// so multiple API clients can share one connection pool.
+    pub fn from_env_with_client(client: reqwest::Client) -> Result<Self> {
         let api_key = env::var("NOTION_API_KEY").context("NOTION_API_KEY not set")?;
         let database_id = env::var("NOTION_DATABASE_ID").context("NOTION_DATABASE_ID not set")?;
         let env_data_source_id = env::var("NOTION_DATA_SOURCE_ID")
             .ok()
             .filter(|s| !s.trim().is_empty());
-        let user_agent = format!("cinelink/{}", env!("CARGO_PKG_VERSION"));
-        let client = Client::builder()
-            .connect_timeout(Duration::from_secs(5))
-            .timeout(Duration::from_secs(30))
-            .user_agent(user_agent)
-            .build()
-            .context("Failed to build Notion HTTP client")?;
+        let mut auth_header = reqwest::header::HeaderValue::try_from(format!("Bearer {}", api_key))
+            .context("NOTION_API_KEY contains invalid header characters")?;
+        auth_header.set_sensitive(true);
         let data_source_id = OnceCell::new();
         if let Some(ds) = env_data_source_id {
             let _ = data_source_id.set(ds);
         }
         Ok(Self {
             client,
-            api_key,
+            auth_header,
             database_id,
             data_source_id,
         })
@@ -166,7 +171,7 @@ impl NotionClient {
             .send_with_retry(|| {
                 self.client
                     .get(&url)
-                    .header("Authorization", format!("Bearer {}", self.api_key))
+                    .header("Authorization", self.auth_header.clone())
                     .header("Notion-Version", NOTION_VERSION)
             })
             .await
@@ -205,19 +210,26 @@ impl NotionClient {
         url: &str,
         start_cursor: Option<&str>,
         page_size: usize,
+        filter: Option<&Value>,
     ) -> Result<DatabaseQueryResponse> {
         let mut body = json!({ "page_size": page_size });
         if let Some(cursor) = start_cursor {
             body["start_cursor"] = Value::String(cursor.to_string());
         }
+        if let Some(filter) = filter {
+            body["filter"] = filter.clone();
+        }
 
+        // Serialize once up front; retries just re-send the same bytes.
+        let body_bytes = serde_json::to_vec(&body).context("Failed to serialize query body")?;
         let res = self
             .send_with_retry(|| {
                 self.client
                     .post(url)
-                    .header("Authorization", format!("Bearer {}", self.api_key))
+                    .header("Authorization", self.auth_header.clone())
                     .header("Notion-Version", NOTION_VERSION)
-                    .json(&body)
+                    .header(reqwest::header::CONTENT_TYPE, "application/json")
+                    .body(body_bytes.clone())
             })
             .await
             .context("Failed to query Notion database")?;
@@ -245,17 +257,30 @@ impl NotionClient {
         &self,
         start_cursor: Option<&str>,
         page_size: usize,
+    ) -> Result<DatabaseQueryResponse> {
+        self.query_database_page_filtered(start_cursor, page_size, None)
+            .await
+    }
+
+    /// Query a database page with an optional Notion `filter` object so the
+    /// API only returns matching pages instead of shipping the whole database
+    /// over the wire.
+    pub async fn query_database_page_filtered(
+        &self,
+        start_cursor: Option<&str>,
+        page_size: usize,
+        filter: Option<&Value>,
     ) -> Result<DatabaseQueryResponse> {
         if let Some(ds_id) = self.data_source_id.get() {
             let url_ds = format!("https://api.notion.com/v1/data_sources/{}/query", ds_id);
-            return self.post_query(&url_ds, start_cursor, page_size).await;
+            return self.post_query(&url_ds, start_cursor, page_size, filter).await;
         }
 
         let url_db = format!(
             "https://api.notion.com/v1/databases/{}/query",
             self.database_id
         );
-        match self.post_query(&url_db, start_cursor, page_size).await {
+        match self.post_query(&url_db, start_cursor, page_size, filter).await {
             Ok(r) => Ok(r),
             Err(e) => {
                 let is_invalid_request_url = e
@@ -267,7 +292,7 @@ impl NotionClient {
                     let ds_id = self.resolve_data_source_id().await?;
                     let url_ds = format!("https://api.notion.com/v1/data_sources/{}/query", ds_id);
                     info!("Database query endpoint rejected; using data source query endpoint");
-                    return self.post_query(&url_ds, start_cursor, page_size).await;
+                    return self.post_query(&url_ds, start_cursor, page_size, filter).await;
                 }
                 Err(e)
             }
@@ -283,7 +308,7 @@ impl NotionApi for NotionClient {
             .send_with_retry(|| {
                 self.client
                     .get(&url)
-                    .header("Authorization", format!("Bearer {}", self.api_key))
+                    .header("Authorization", self.auth_header.clone())
                     .header("Notion-Version", NOTION_VERSION)
             })
             .await
@@ -327,7 +352,7 @@ impl NotionApi for NotionClient {
             .send_with_retry(|| {
                 self.client
                     .get(&url)
-                    .header("Authorization", format!("Bearer {}", self.api_key))
+                    .header("Authorization", self.auth_header.clone())
                     .header("Notion-Version", NOTION_VERSION)
             })
             .await
@@ -365,13 +390,16 @@ impl NotionApi for NotionClient {
             body["cover"] = cover_val;
         }
 
+        // Serialize once up front; retries just re-send the same bytes.
+        let body_bytes = serde_json::to_vec(&body).context("Failed to serialize update body")?;
         let res = self
             .send_with_retry(|| {
                 self.client
                     .patch(&url)
-                    .header("Authorization", format!("Bearer {}", self.api_key))
+                    .header("Authorization", self.auth_header.clone())
                     .header("Notion-Version", NOTION_VERSION)
-                    .json(&body)
+                    .header(reqwest::header::CONTENT_TYPE, "application/json")
+                    .body(body_bytes.clone())
             })
             .await
             .context("Failed to update Notion page")?;
@@ -443,11 +471,7 @@ pub fn set_title(
     value: &str,
     schema: &PropertySchema,
 ) {
-    let prop_type = schema
-        .types
-        .get(property)
-        .cloned()
-        .unwrap_or(PropertyType::Title);
+    let prop_type = schema.types.get(property).unwrap_or(&PropertyType::Title);
     if matches!(prop_type, PropertyType::Title) {
         target.insert(
             property.to_string(),
@@ -548,8 +572,7 @@ pub fn set_value(
     let prop_type = schema
         .types
         .get(property)
-        .cloned()
-        .unwrap_or(PropertyType::RichText);
+        .unwrap_or(&PropertyType::RichText);
 
     let payload = match prop_type {
         PropertyType::Title => Some(json!({
@@ -611,21 +634,3 @@ fn string_value_opt(val: ValueInput) -> Option<String> {
     }
 }
 
-fn retry_delay(attempt: usize, retry_after: Option<&reqwest::header::HeaderValue>) -> Duration {
-    if let Some(v) = retry_after.and_then(|h| h.to_str().ok()) {
-        if let Ok(secs) = v.parse::<u64>() {
-            return Duration::from_secs(secs.min(30));
-        }
-    }
-    let base_ms = 200u64.saturating_mul(2u64.saturating_pow((attempt - 1) as u32));
-    let jitter_ms = jitter_ms();
-    Duration::from_millis((base_ms + jitter_ms).min(5_000))
-}
-
-fn jitter_ms() -> u64 {
-    use std::time::{SystemTime, UNIX_EPOCH};
-    let now = SystemTime::now()
-        .duration_since(UNIX_EPOCH)
-        .unwrap_or_default();
-    (now.subsec_millis() as u64) % 100
-}
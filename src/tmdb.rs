@@ -1,15 +1,19 @@
+use crate::http::retry_delay;
 use anyhow::{anyhow, Context, Result};
 use async_trait::async_trait;
 use reqwest::Client;
 use serde::Deserialize;
 use std::collections::HashMap;
 use std::env;
-use std::time::Duration;
-use tokio::sync::OnceCell;
+use std::sync::Arc;
+use std::time::Instant;
+use tokio::sync::{Mutex, OnceCell};
 
 const TMDB_BASE: &str = "https://api.themoviedb.org/3";
 const POSTER_BASE: &str = "https://image.tmdb.org/t/p/original";
 const MAX_RETRIES: usize = 3;
+const MEDIA_CACHE_TTL_SECS: u64 = 60 * 60 * 24; // 24 hours
+const MAX_MEDIA_CACHE_ENTRIES: usize = 10_000;
 
 #[derive(Debug, Clone)]
 pub struct TmdbClient {
@@ -17,6 +21,19 @@ pub struct TmdbClient {
     api_key: String,
     countries: OnceCell<HashMap<String, String>>,
     languages: OnceCell<HashMap<String, String>>,
+    media_cache: Arc<Mutex<HashMap<MediaCacheKey, MediaCacheEntry>>>,
+}
+
+#[derive(Debug, Clone, PartialEq, Eq, Hash)]
+enum MediaCacheKey {
+    Movie(i32),
+    TvSeason(i32, i32),
+}
+
+#[derive(Debug, Clone)]
+struct MediaCacheEntry {
+    inserted_at: Instant,
+    value: MediaData,
 }
 
 #[async_trait]
@@ -57,22 +74,54 @@ pub struct MediaData {
 
 impl TmdbClient {
     pub fn from_env() -> Result<Self> {
+        let client = crate::http::build_client().context("Failed to build TMDB HTTP client")?;
+        Self::from_env_with_client(client)
+    }
+
+    /// Like [`from_env`](Self::from_env) but reusing an already-built client,
+    /// so multiple API clients can share one connection pool.
+    pub fn from_env_with_client(client: reqwest::Client) -> Result<Self> {
         let api_key = env::var("TMDB_API_KEY").context("TMDB_API_KEY not set")?;
-        let user_agent = format!("cinelink/{}", env!("CARGO_PKG_VERSION"));
-        let client = Client::builder()
-            .connect_timeout(Duration::from_secs(5))
-            .timeout(Duration::from_secs(30))
-            .user_agent(user_agent)
-            .build()
-            .context("Failed to build TMDB HTTP client")?;
         Ok(Self {
             client,
             api_key,
             countries: OnceCell::new(),
             languages: OnceCell::new(),
+            media_cache: Arc::new(Mutex::new(HashMap::new())),
         })
     }
 
+    async fn get_cached_media(&self, key: &MediaCacheKey) -> Option<MediaData> {
+        let mut guard = self.media_cache.lock().await;
+        match guard.get(key) {
+            Some(entry) if entry.inserted_at.elapsed().as_secs() < MEDIA_CACHE_TTL_SECS => {
+                Some(entry.value.clone())
+            }
+            Some(_) => {
+                guard.remove(key);
+                None
+            }
+            None => None,
+        }
+    }
+
+    async fn put_cached_media(&self, key: MediaCacheKey, value: MediaData) {
+        let mut guard = self.media_cache.lock().await;
+        if guard.len() >= MAX_MEDIA_CACHE_ENTRIES {
+            guard.retain(|_, e| e.inserted_at.elapsed().as_secs() < MEDIA_CACHE_TTL_SECS);
+            if guard.len() >= MAX_MEDIA_CACHE_ENTRIES {
+                guard.clear();
+            }
+        }
+        guard.insert(
+            key,
+            MediaCacheEntry {
+                inserted_at: Instant::now(),
+                value,
+            },
+        );
+    }
+
     async fn fetch_movie_images(&self, id: i32, lang: &str) -> Result<ImageResponse> {
         let url = format!(
             "{TMDB_BASE}/movie/{id}/images?include_image_language={lang},null&api_key={}",
@@ -165,6 +214,28 @@ impl TmdbApi for TmdbClient {
     }
 
     async fn fetch_movie(&self, id: i32) -> Result<MediaData> {
+        let key = MediaCacheKey::Movie(id);
+        if let Some(cached) = self.get_cached_media(&key).await {
+            return Ok(cached);
+        }
+        let data = self.fetch_movie_uncached(id).await?;
+        self.put_cached_media(key, data.clone()).await;
+        Ok(data)
+    }
+
+    async fn fetch_tv_season(&self, id: i32, season: i32) -> Result<MediaData> {
+        let key = MediaCacheKey::TvSeason(id, season);
+        if let Some(cached) = self.get_cached_media(&key).await {
+            return Ok(cached);
+        }
+        let data = self.fetch_tv_season_uncached(id, season).await?;
+        self.put_cached_media(key, data.clone()).await;
+        Ok(data)
+    }
+}
+
+impl TmdbClient {
+    async fn fetch_movie_uncached(&self, id: i32) -> Result<MediaData> {
         // Try a single "append_to_response" request first (fewer round trips).
         // If TMDB changes the response shape or an append isn't supported, fall back to the
         // previous multi-request approach (still parallelized).
@@ -251,7 +322,12 @@ impl TmdbApi for TmdbClient {
             detail.origin_country.as_ref(),
             detail.production_countries.as_ref(),
         );
-        let country = self.country_names(country_codes).await;
+        // Country and language names are independent lookups (each may hit a
+        // TMDB configuration endpoint on first use), so run them concurrently.
+        let (country, language) = tokio::join!(
+            self.country_names(country_codes),
+            self.language_display_name(&detail.original_language),
+        );
         let genres = names(detail.genres.as_ref());
         let release_date = detail.release_date.clone();
         let year = release_date.as_deref().and_then(extract_year);
@@ -259,7 +335,6 @@ impl TmdbApi for TmdbClient {
             .imdb_id
             .as_ref()
             .map(|id| format!("https://www.imdb.com/title/{id}"));
-        let language = self.language_display_name(&detail.original_language).await;
         let use_original = detail.original_language == "fr" || detail.original_language == "es";
         let name = if use_original {
             detail.original_title.clone()
@@ -296,7 +371,7 @@ impl TmdbApi for TmdbClient {
         })
     }
 
-    async fn fetch_tv_season(&self, id: i32, season: i32) -> Result<MediaData> {
+    async fn fetch_tv_season_uncached(&self, id: i32, season: i32) -> Result<MediaData> {
         let url_season = format!(
             "{TMDB_BASE}/tv/{id}/season/{season}?language=en-US&api_key={}",
             self.api_key
@@ -359,7 +434,11 @@ impl TmdbApi for TmdbClient {
             .as_ref()
             .map(|p| format!("{POSTER_BASE}{p}"));
         let country_codes = origin_country(Some(&show_detail.origin_country), None);
-        let country = self.country_names(country_codes).await;
+        // Same as the movie path: resolve country and language names in parallel.
+        let (country, language) = tokio::join!(
+            self.country_names(country_codes),
+            self.language_display_name(&show_detail.original_language),
+        );
         let genres = names(show_detail.genres.as_ref());
         let air_date = season_detail.air_date.clone();
         let year = air_date.as_deref().and_then(extract_year);
@@ -374,9 +453,6 @@ impl TmdbApi for TmdbClient {
             .unwrap_or_default();
         let episodes_count = season_detail.episodes.len();
         let runtime = average_episode_runtime(&season_detail, &show_detail);
-        let language = self
-            .language_display_name(&show_detail.original_language)
-            .await;
         let use_original =
             show_detail.original_language == "fr" || show_detail.original_language == "es";
         let name = if use_original {
@@ -586,24 +662,6 @@ impl TmdbClient {
     }
 }
 
-fn retry_delay(attempt: usize, retry_after: Option<&reqwest::header::HeaderValue>) -> Duration {
-    if let Some(v) = retry_after.and_then(|h| h.to_str().ok()) {
-        if let Ok(secs) = v.parse::<u64>() {
-            return Duration::from_secs(secs.min(30));
-        }
-    }
-    let base_ms = 200u64.saturating_mul(2u64.saturating_pow((attempt - 1) as u32));
-    let jitter_ms = jitter_ms();
-    Duration::from_millis((base_ms + jitter_ms).min(5_000))
-}
-
-fn jitter_ms() -> u64 {
-    use std::time::{SystemTime, UNIX_EPOCH};
-    let now = SystemTime::now()
-        .duration_since(UNIX_EPOCH)
-        .unwrap_or_default();
-    (now.subsec_millis() as u64) % 100
-}
 
 #[derive(Debug, Deserialize)]
 struct Genre {
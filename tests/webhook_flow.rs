@@ -277,6 +277,7 @@ fn app_with_mocks(page: Value, tmdb: FakeTmdb) -> (Router, Arc<FakeNotion>) {
             count: 0,
         })),
         recent_events: Arc::new(tokio::sync::Mutex::new(std::collections::HashMap::new())),
+        dedupe_store: None,
         processing_sem: Arc::new(tokio::sync::Semaphore::new(8)),
     };
 